@@ -2,83 +2,19 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import csv
 import random
-import math
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from colony import CityTable, AntResult, IterationRecord, AntColony, new_tour_buffer, euclidean_distance_matrix
 
 
-class AntColony:
-    def __init__(self, cities, distance_matrix, ant_count, alpha=1.0, beta=2.0, rho=0.1, Q=100):
-        self.cities = cities
-        self.city_count = len(cities)
-        self.distance_matrix = distance_matrix
-        self.ant_count = ant_count
-        self.alpha = alpha
-        self.beta = beta
-        self.rho = rho
-        self.Q = Q
-        self.pheromone = [[1.0 for _ in range(self.city_count)] for _ in range(self.city_count)]
-    
-    def build_ant_path(self):
-        start = 0
-        visited = [start]
-        current = start
-        total_distance = 0
-        while len(visited) < self.city_count:
-            next_city = self.choose_next_city(current, visited)
-            visited.append(next_city)
-            total_distance += self.distance_matrix[current][next_city]
-            current = next_city
-        total_distance += self.distance_matrix[current][start]
-        visited.append(start)
-        return visited, total_distance
-
-    def choose_next_city(self, current, visited):
-        probabilities = []
-        total_prob = 0
-        for j in range(self.city_count):
-            if j not in visited:
-                pheromone_val = self.pheromone[current][j] ** self.alpha
-                distance_val = (1.0 / self.distance_matrix[current][j]) ** self.beta if self.distance_matrix[current][j] != 0 else 0
-                prob = pheromone_val * distance_val
-                probabilities.append((j, prob))
-                total_prob += prob
-        
-        if total_prob == 0:
-            candidates = [j for j in range(self.city_count) if j not in visited]
-            return random.choice(candidates)
-        
-        r = random.uniform(0, total_prob)
-        cumulative = 0
-        for (j, prob) in probabilities:
-            cumulative += prob
-            if r <= cumulative:
-                return j
-        return probabilities[-1][0]
-    
-    def update_pheromones(self, all_paths):
-        for i in range(self.city_count):
-            for j in range(self.city_count):
-                self.pheromone[i][j] *= (1 - self.rho)
-                if self.pheromone[i][j] < 0.1:
-                    self.pheromone[i][j] = 0.1
-                if self.pheromone[i][j] > 50:
-                    self.pheromone[i][j] = 50
-        for path, distance in all_paths:
-            deposit = self.Q / distance
-            for k in range(len(path) - 1):
-                i = path[k]
-                j = path[k+1]
-                self.pheromone[i][j] += deposit
-                self.pheromone[j][i] += deposit
-
 # Tkinter arayüzü
 class AntColonyFrame(tk.Frame):
     def __init__(self, parent, cities=None):
         super().__init__(parent)
         self.parent = parent
-        self.cities = cities
+        self.cities = CityTable(cities) if cities is not None else None
         self.distance_matrix = None
+        self.ant_tours = None  # Her karınca için iterasyonlar arasında yeniden kullanılan yol tamponu
         
         self.ant_count = 20
         self.city_count = 10
@@ -103,6 +39,11 @@ class AntColonyFrame(tk.Frame):
         self.initial_best_path = None
         self.cities_drawn = False
         self.manual_distance_set = False  # Manuel mesafe girişi için bayrak
+        self.table_rows_per_page = 5  # Mesafe tablosunda aynı anda gösterilen satır sayısı
+        self.table_row_offset = 0
+        self.table_cols_per_page = 10  # Her satırda aynı anda gösterilen mesafe sayısı
+        self.table_col_offset = 0
+        self.manual_page_size = 10  # Manuel girişte görünen hücre penceresi (satır x sütun)
         
         self.create_widgets()
     
@@ -167,8 +108,25 @@ class AntColonyFrame(tk.Frame):
         self.graph_canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
         self.graph_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        self.info_text = tk.Text(self, height=5)
-        self.info_text.pack(fill=tk.X, padx=5, pady=5)
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        table_nav = tk.Frame(table_frame)
+        table_nav.pack(side=tk.RIGHT, fill=tk.Y)
+        tk.Button(table_nav, text="▲", command=lambda: self.scroll_distance_table(-self.table_rows_per_page)).pack(fill=tk.X)
+        self.table_page_label = tk.Label(table_nav, text="-")
+        self.table_page_label.pack(fill=tk.X)
+        tk.Button(table_nav, text="▼", command=lambda: self.scroll_distance_table(self.table_rows_per_page)).pack(fill=tk.X)
+        table_col_nav = tk.Frame(table_nav)
+        table_col_nav.pack(fill=tk.X)
+        tk.Button(table_col_nav, text="◀", command=lambda: self.scroll_distance_table(0, -self.table_cols_per_page)).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Button(table_col_nav, text="▶", command=lambda: self.scroll_distance_table(0, self.table_cols_per_page)).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.info_text = tk.Text(table_frame, height=self.table_rows_per_page, wrap=tk.NONE)
+        self.info_text.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.info_text.bind("<MouseWheel>", lambda e: self.scroll_distance_table(-1 if e.delta > 0 else 1) or "break")
+        self.info_text.bind("<Button-4>", lambda e: self.scroll_distance_table(-1) or "break")
+        self.info_text.bind("<Button-5>", lambda e: self.scroll_distance_table(1) or "break")
         
         self.status_label = tk.Label(self, text="Iteration: - | BEST: - | TOP 4: - | BEST PATH: -")
         self.status_label.pack(fill=tk.X, padx=5, pady=5)
@@ -180,7 +138,7 @@ class AntColonyFrame(tk.Frame):
             self.city_count_entry.config(state=tk.NORMAL)
     
     def generate_cities(self):
-        self.cities = []
+        self.cities = CityTable()
         margin = 20
         width = self.canvas.winfo_width() if self.canvas.winfo_width() > 1 else 700
         height = self.canvas.winfo_height() if self.canvas.winfo_height() > 1 else 500
@@ -188,14 +146,14 @@ class AntColonyFrame(tk.Frame):
             x = random.randint(margin, width - margin)
             y = random.randint(margin, height - margin)
             label = chr(65 + i)
-            self.cities.append((x, y, label))
+            self.cities.append(x, y, label)
     
     def load_cities_from_csv(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if file_path:
             with open(file_path, 'r') as f:
                 reader = csv.reader(f)
-                self.cities = []
+                self.cities = CityTable()
                 mode = 'cities'  # Dosyanın hangi bölümünü okuduğumuzu takip etmek için
                 distance_matrix = []
                 for row in reader:
@@ -209,7 +167,7 @@ class AntColonyFrame(tk.Frame):
                             label = row[0]
                             x = int(row[1])
                             y = int(row[2])
-                            self.cities.append((x, y, label))
+                            self.cities.append(x, y, label)
                         except (ValueError, IndexError):
                             messagebox.showerror("Hata", "CSV dosyasında geçersiz veri formatı.")
                             return
@@ -229,74 +187,157 @@ class AntColonyFrame(tk.Frame):
                 self.distance_matrix[j][i] = value
     
     def calculate_distance_matrix_euclidean(self):
-        self.distance_matrix = [[0] * self.city_count for _ in range(self.city_count)]
-        for i in range(self.city_count):
-            for j in range(self.city_count):
-                if i == j:
-                    self.distance_matrix[i][j] = 0
-                else:
-                    xi, yi, _ = self.cities[i]
-                    xj, yj, _ = self.cities[j]
-                    self.distance_matrix[i][j] = int(math.sqrt((xi - xj) ** 2 + (yi - yj) ** 2))
+        self.distance_matrix = euclidean_distance_matrix(self.cities)
     
     def open_manual_distance_panel(self):
         self.manual_distance_set = False
         toplevel = tk.Toplevel(self)
         toplevel.title("Manuel Mesafe Girişi")
         
+        # Girilen değerler (i, j), i < j anahtarıyla saklanır; ekranda sadece görünen pencere için Entry bulunur
+        self.manual_values = {}
+        page = min(self.manual_page_size, self.city_count)
+        offset = {'row': 0, 'col': 0}
+        
         frame = tk.Frame(toplevel)
         frame.pack(padx=10, pady=10)
         
-        self.distance_vars = {}
-        for i in range(self.city_count):
-            for j in range(i + 1, self.city_count):
-                var = tk.StringVar()
-                self.distance_vars[(i, j)] = var
-        
-        for c in range(self.city_count):
-            label = tk.Label(frame, text=self.cities[c][2])
+        col_labels = [tk.Label(frame, width=5) for _ in range(page)]
+        for c, label in enumerate(col_labels):
             label.grid(row=0, column=c + 1)
-        
-        for r in range(self.city_count):
-            label = tk.Label(frame, text=self.cities[r][2])
+        row_labels = [tk.Label(frame, width=5) for _ in range(page)]
+        for r, label in enumerate(row_labels):
             label.grid(row=r + 1, column=0)
-            for c in range(self.city_count):
-                if r == c:
-                    label = tk.Label(frame, text="0")
-                    label.grid(row=r + 1, column=c + 1)
-                elif r < c:
-                    var = self.distance_vars[(r, c)]
-                    entry = tk.Entry(frame, textvariable=var, width=5)
-                    entry.grid(row=r + 1, column=c + 1)
-                else:
-                    var = self.distance_vars[(c, r)]
-                    entry = tk.Entry(frame, textvariable=var, width=5, state='disabled')
-                    entry.grid(row=r + 1, column=c + 1)
+        
+        cell_vars = [[tk.StringVar() for _ in range(page)] for _ in range(page)]
+        cell_entries = [[None] * page for _ in range(page)]
+        for r in range(page):
+            for c in range(page):
+                entry = tk.Entry(frame, textvariable=cell_vars[r][c], width=5)
+                entry.grid(row=r + 1, column=c + 1)
+                cell_entries[r][c] = entry
+        
+        def cell_key(i, j):
+            return (i, j) if i < j else (j, i)
+        
+        def sync_mirror(r, c):
+            # Üst üçgendeki değişiklik, pencerede görünüyorsa alt üçgendeki simetrik hücreye yansıtılır
+            i = offset['row'] + r
+            j = offset['col'] + c
+            if i >= j or j >= self.city_count:
+                return
+            mirror_r = j - offset['row']
+            mirror_c = i - offset['col']
+            if 0 <= mirror_r < page and 0 <= mirror_c < page:
+                cell_vars[mirror_r][mirror_c].set(cell_vars[r][c].get())
+        
+        for r in range(page):
+            for c in range(page):
+                cell_vars[r][c].trace_add('write', lambda *args, r=r, c=c: sync_mirror(r, c))
+        
+        def store_visible():
+            for r in range(page):
+                for c in range(page):
+                    i = offset['row'] + r
+                    j = offset['col'] + c
+                    if i >= self.city_count or j >= self.city_count or i >= j:
+                        continue
+                    val_str = cell_vars[r][c].get().strip()
+                    if val_str:
+                        self.manual_values[(i, j)] = val_str
+                    else:
+                        self.manual_values.pop((i, j), None)
+        
+        def render_visible():
+            for c in range(page):
+                j = offset['col'] + c
+                col_labels[c].config(text=self.cities[j][2] if j < self.city_count else "")
+            for r in range(page):
+                i = offset['row'] + r
+                row_labels[r].config(text=self.cities[i][2] if i < self.city_count else "")
+                for c in range(page):
+                    j = offset['col'] + c
+                    entry = cell_entries[r][c]
+                    var = cell_vars[r][c]
+                    if i >= self.city_count or j >= self.city_count:
+                        entry.config(state='normal')
+                        var.set("")
+                        entry.config(state='disabled')
+                    elif i == j:
+                        entry.config(state='normal')
+                        var.set("0")
+                        entry.config(state='disabled')
+                    else:
+                        entry.config(state='normal')
+                        var.set(self.manual_values.get(cell_key(i, j), ""))
+                        if i > j:
+                            entry.config(state='disabled')
+            position_label.config(
+                text=f"Satır {offset['row'] + 1}-{min(self.city_count, offset['row'] + page)} | "
+                     f"Sütun {offset['col'] + 1}-{min(self.city_count, offset['col'] + page)} / {self.city_count}"
+            )
+        
+        def move(d_row, d_col):
+            store_visible()
+            max_offset = max(0, self.city_count - page)
+            offset['row'] = max(0, min(max_offset, offset['row'] + d_row * page))
+            offset['col'] = max(0, min(max_offset, offset['col'] + d_col * page))
+            render_visible()
+        
+        nav_frame = tk.Frame(toplevel)
+        nav_frame.pack(padx=10)
+        tk.Button(nav_frame, text="▲", command=lambda: move(-1, 0)).pack(side=tk.LEFT)
+        tk.Button(nav_frame, text="▼", command=lambda: move(1, 0)).pack(side=tk.LEFT)
+        tk.Button(nav_frame, text="◀", command=lambda: move(0, -1)).pack(side=tk.LEFT)
+        tk.Button(nav_frame, text="▶", command=lambda: move(0, 1)).pack(side=tk.LEFT)
+        position_label = tk.Label(nav_frame)
+        position_label.pack(side=tk.LEFT, padx=5)
+        
+        render_visible()
         
         def fill_random():
-            for var in self.distance_vars.values():
-                if not var.get():
-                    var.set(str(random.randint(5, 100)))
+            store_visible()
+            for i in range(self.city_count):
+                for j in range(i + 1, self.city_count):
+                    if (i, j) not in self.manual_values:
+                        self.manual_values[(i, j)] = str(random.randint(5, 100))
+            render_visible()
         
         random_button = tk.Button(toplevel, text="Random", command=fill_random)
         random_button.pack(side=tk.LEFT, padx=5, pady=5)
         
+        def show_cell(i, j):
+            store_visible()
+            max_offset = max(0, self.city_count - page)
+            offset['row'] = min(max_offset, (i // page) * page)
+            offset['col'] = min(max_offset, (j // page) * page)
+            render_visible()
+            cell_entries[i - offset['row']][j - offset['col']].focus_set()
+        
         def confirm():
-            try:
-                distance_matrix = [[0] * self.city_count for _ in range(self.city_count)]
-                for i in range(self.city_count):
-                    for j in range(i + 1, self.city_count):
-                        val_str = self.distance_vars[(i, j)].get()
-                        if not val_str:
-                            raise ValueError("Boş alan var")
-                        val = int(val_str)
-                        distance_matrix[i][j] = val
-                        distance_matrix[j][i] = val
-                self.distance_matrix = distance_matrix
-                self.manual_distance_set = True
-                toplevel.destroy()
-            except ValueError:
-                messagebox.showerror("Hata", "Tüm mesafeler tam sayı olmalı.")
+            store_visible()
+            distance_matrix = [[0] * self.city_count for _ in range(self.city_count)]
+            for i in range(self.city_count):
+                for j in range(i + 1, self.city_count):
+                    val_str = self.manual_values.get((i, j))
+                    pair = f"{self.cities[i][2]}-{self.cities[j][2]}"
+                    if not val_str:
+                        error = f"Boş alan var: {pair}"
+                    else:
+                        try:
+                            val = int(val_str)
+                            distance_matrix[i][j] = val
+                            distance_matrix[j][i] = val
+                            continue
+                        except ValueError:
+                            error = f"{pair} mesafesi tam sayı olmalı: {val_str}"
+                    # Hatalı hücre ekrana getirilir; büyük matrislerde kullanıcı elle aramak zorunda kalmaz
+                    show_cell(i, j)
+                    messagebox.showerror("Hata", error, parent=toplevel)
+                    return
+            self.distance_matrix = distance_matrix
+            self.manual_distance_set = True
+            toplevel.destroy()
         
         confirm_button = tk.Button(toplevel, text="Confirm", command=confirm)
         confirm_button.pack(side=tk.LEFT, padx=5, pady=5)
@@ -506,8 +547,11 @@ class AntColonyFrame(tk.Frame):
                 return
     
     def after_distance_setup(self):
+        self.table_row_offset = 0
+        self.table_col_offset = 0
         self.display_distance_table()  
         self.ant_colony = AntColony(self.cities, self.distance_matrix, self.ant_count, self.alpha, self.beta, self.rho, self.Q)
+        self.ant_tours = [new_tour_buffer(self.city_count) for _ in range(self.ant_count)]
         self.draw_cities()
         self.start_button.config(state=tk.DISABLED)
         self.pause_button.config(state=tk.NORMAL)
@@ -521,6 +565,9 @@ class AntColonyFrame(tk.Frame):
     def restart_simulation(self):
         self.canvas.delete("all")
         self.info_text.delete(1.0, tk.END)
+        self.table_row_offset = 0
+        self.table_col_offset = 0
+        self.table_page_label.config(text="-")
         self.status_label.config(text="Iteration: - | BEST: - | TOP 4: - | BEST PATH: -")
         self.start_button.config(state=tk.NORMAL)
         self.pause_button.config(state=tk.DISABLED, text="Pause")
@@ -535,6 +582,7 @@ class AntColonyFrame(tk.Frame):
         self.cities = None
         self.distance_matrix = None
         self.ant_colony = None
+        self.ant_tours = None
         self.best_path = None
         self.best_distance = float('inf')
         self.best_ant = None
@@ -558,7 +606,9 @@ class AntColonyFrame(tk.Frame):
         self.canvas.delete("pheromone")
         self.canvas.delete("best_path")
         self.canvas.delete("ant")
-        self.ant_colony.pheromone = [[1.0 for _ in range(self.city_count)] for _ in range(self.city_count)]
+        self.canvas.delete("ant_text")
+        self.active_ants.clear()
+        self.ant_colony.reset_pheromones()
         self.simulation_data = []
         self.initial_best_path = None
         self.ax.clear()
@@ -574,14 +624,32 @@ class AntColonyFrame(tk.Frame):
             self.simulation_loop()
     
     def display_distance_table(self):
+        # Sadece görünen satırlar oluşturulur; büyük matrislerde tüm tablo metne dökülmez
         self.info_text.delete(1.0, tk.END)
-        for i in range(self.city_count):
-            line = f"{self.cities[i][2]}: "
-            for j in range(self.city_count):
-                if i != j:
-                    dist = self.distance_matrix[i][j]
-                    line += f"{self.cities[i][2]}->{self.cities[j][2]} ({dist})  "
-            self.info_text.insert(tk.END, line + "\n")
+        if not self.cities or not self.distance_matrix:
+            self.table_page_label.config(text="-")
+            return
+        max_row_offset = max(0, self.city_count - self.table_rows_per_page)
+        self.table_row_offset = max(0, min(self.table_row_offset, max_row_offset))
+        max_col_offset = max(0, self.city_count - self.table_cols_per_page)
+        self.table_col_offset = max(0, min(self.table_col_offset, max_col_offset))
+        first = self.table_row_offset
+        last = min(self.city_count, first + self.table_rows_per_page)
+        first_col = self.table_col_offset
+        last_col = min(self.city_count, first_col + self.table_cols_per_page)
+        for i in range(first, last):
+            row = self.distance_matrix[i]
+            label_i = self.cities[i][2]
+            parts = [f"{label_i}->{self.cities[j][2]} ({row[j]})" for j in range(first_col, last_col) if i != j]
+            self.info_text.insert(tk.END, f"{label_i}: " + "  ".join(parts) + "  \n")
+        self.table_page_label.config(text=f"{first + 1}-{last} | {first_col + 1}-{last_col}/{self.city_count}")
+    
+    def scroll_distance_table(self, rows, cols=0):
+        if not self.cities or not self.distance_matrix:
+            return
+        self.table_row_offset += rows
+        self.table_col_offset += cols
+        self.display_distance_table()
     
     def save_to_csv(self):
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
@@ -600,8 +668,8 @@ class AntColonyFrame(tk.Frame):
     
     def update_graph(self):
         self.ax.clear()
-        iterations = [data['iteration'] for data in self.simulation_data]
-        distances = [data['best_distance'] for data in self.simulation_data]
+        iterations = [data.iteration for data in self.simulation_data]
+        distances = [data.best_distance for data in self.simulation_data]
         self.ax.plot(iterations, distances, marker='o')
         self.ax.set_xlabel('Iteration')
         self.ax.set_ylabel('Best Distance')
@@ -611,6 +679,9 @@ class AntColonyFrame(tk.Frame):
     def simulation_loop(self):
         if self.paused:
             return
+        if self.active_ants:
+            # Önceki tur hâlâ sürüyor; karınca tamponları o tur bitmeden yeniden yazılmamalı
+            return
         if self.current_iteration >= self.iterations:
             best_path_str = " -> ".join([self.cities[i][2] for i in self.best_path]) if self.best_path else "-"
             self.status_label.config(text=f"Simulation finished. BEST: {self.best_ant} | TOP 4: {', '.join(map(str, self.top4_ants))} | Distance: {int(self.best_distance)} | BEST PATH: {best_path_str}")
@@ -618,33 +689,28 @@ class AntColonyFrame(tk.Frame):
             return
         
         finished_count = 0
-        collected_paths = []
         iteration_results = []
         
         def ant_callback(ant_num, path, distance):
             nonlocal finished_count
-            collected_paths.append((path, distance))
-            iteration_results.append((ant_num, distance, path))
+            iteration_results.append(AntResult(ant_num, distance, path))
             finished_count += 1
             if finished_count == self.ant_count:
-                sorted_results = sorted(iteration_results, key=lambda x: x[1])
-                iter_best_ant, iter_best_distance, iter_best_path = sorted_results[0]
-                if iter_best_distance < self.best_distance:
-                    self.best_distance = iter_best_distance
-                    self.best_ant = iter_best_ant
+                sorted_results = sorted(iteration_results, key=lambda x: x.distance)
+                iter_best = sorted_results[0]
+                if iter_best.distance < self.best_distance:
+                    # Karınca tamponları sonraki iterasyonda yeniden yazıldığı için en iyi yol kopyalanır
+                    self.best_distance = iter_best.distance
+                    self.best_ant = iter_best.ant
                     self.best_iteration = self.current_iteration
-                    self.best_path = iter_best_path
+                    self.best_path = iter_best.path[:]
                     if self.current_iteration == 0 and not self.initial_best_path:
-                        self.initial_best_path = iter_best_path
-                self.top4_ants = [ant for ant, _, _ in sorted_results[:4]]
-                self.ant_colony.update_pheromones(collected_paths)
+                        self.initial_best_path = self.best_path
+                self.top4_ants = [result.ant for result in sorted_results[:4]]
+                self.ant_colony.update_pheromones((result.path, result.distance) for result in iteration_results)
                 
                 if self.best_path:
-                    self.simulation_data.append({
-                        'iteration': self.current_iteration + 1,
-                        'best_distance': self.best_distance,
-                        'best_path': self.best_path
-                    })
+                    self.simulation_data.append(IterationRecord(self.current_iteration + 1, self.best_distance, self.best_path))
                     self.update_graph()
                 
                 self.draw_roads()
@@ -663,7 +729,7 @@ class AntColonyFrame(tk.Frame):
         
         for ant_number in range(1, self.ant_count + 1):
             if ant_number not in self.active_ants:
-                path, distance = self.ant_colony.build_ant_path()
+                path, distance = self.ant_colony.build_ant_path(self.ant_tours[ant_number - 1])
                 self.animate_ant_path(path, ant_number, lambda an=ant_number, p=path, d=distance: ant_callback(an, p, d))
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+import random
+import math
+from array import array
+
+COORD_MIN = -2 ** 63  # CityTable koordinatları 'q' (64 bit) dizilerinde tutulur
+COORD_MAX = 2 ** 63 - 1
+
+
+# Şehirler tek tek tuple yerine sütun dizilerinde (x, y, etiket) tutulur
+class CityTable:
+    __slots__ = ('xs', 'ys', 'labels')
+    
+    def __init__(self, cities=()):
+        self.xs = array('q')
+        self.ys = array('q')
+        self.labels = []
+        for x, y, label in cities:
+            self.append(x, y, label)
+    
+    def append(self, x, y, label):
+        if not (COORD_MIN <= x <= COORD_MAX and COORD_MIN <= y <= COORD_MAX):
+            raise ValueError(f"Koordinat aralık dışında: ({x}, {y})")
+        self.xs.append(x)
+        self.ys.append(y)
+        self.labels.append(label)
+    
+    def __len__(self):
+        return len(self.labels)
+    
+    def __getitem__(self, index):
+        return self.xs[index], self.ys[index], self.labels[index]
+    
+    def __iter__(self):
+        return zip(self.xs, self.ys, self.labels)
+
+
+class AntResult:
+    __slots__ = ('ant', 'distance', 'path')
+    
+    def __init__(self, ant, distance, path):
+        self.ant = ant
+        self.distance = distance
+        self.path = path
+
+
+class IterationRecord:
+    __slots__ = ('iteration', 'best_distance', 'best_path')
+    
+    def __init__(self, iteration, best_distance, best_path):
+        self.iteration = iteration
+        self.best_distance = best_distance
+        self.best_path = best_path
+
+
+def new_tour_buffer(city_count):
+    return array('i', [0]) * (city_count + 1)
+
+
+class AntColony:
+    def __init__(self, cities, distance_matrix, ant_count, alpha=1.0, beta=2.0, rho=0.1, Q=100):
+        self.cities = cities
+        self.city_count = len(cities)
+        self.distance_matrix = distance_matrix
+        self.ant_count = ant_count
+        self.alpha = alpha
+        self.beta = beta
+        self.rho = rho
+        self.Q = Q
+        self.reset_pheromones()
+        self._weights = array('d', [0.0]) * self.city_count
+    
+    def reset_pheromones(self):
+        self.pheromone = [array('d', [1.0]) * self.city_count for _ in range(self.city_count)]
+    
+    def build_ant_path(self, tour=None):
+        # tour verilirse (new_tour_buffer) yol bu tampona yazılır, her iterasyonda yeni liste oluşturulmaz
+        if tour is None:
+            tour = new_tour_buffer(self.city_count)
+        start = 0
+        visited = bytearray(self.city_count)
+        visited[start] = 1
+        tour[0] = start
+        current = start
+        total_distance = 0
+        for step in range(1, self.city_count):
+            next_city = self.choose_next_city(current, visited)
+            visited[next_city] = 1
+            tour[step] = next_city
+            total_distance += self.distance_matrix[current][next_city]
+            current = next_city
+        total_distance += self.distance_matrix[current][start]
+        tour[self.city_count] = start
+        return tour, total_distance
+
+    def choose_next_city(self, current, visited):
+        weights = self._weights
+        pheromone_row = self.pheromone[current]
+        distance_row = self.distance_matrix[current]
+        total_prob = 0
+        for j in range(self.city_count):
+            if visited[j]:
+                weights[j] = 0.0
+                continue
+            pheromone_val = pheromone_row[j] ** self.alpha
+            distance_val = (1.0 / distance_row[j]) ** self.beta if distance_row[j] != 0 else 0
+            prob = pheromone_val * distance_val
+            weights[j] = prob
+            total_prob += prob
+        
+        if total_prob == 0:
+            candidates = [j for j in range(self.city_count) if not visited[j]]
+            return random.choice(candidates)
+        
+        r = random.uniform(0, total_prob)
+        cumulative = 0
+        last = current
+        for j in range(self.city_count):
+            if visited[j]:
+                continue
+            last = j
+            cumulative += weights[j]
+            if r <= cumulative:
+                return j
+        return last
+    
+    def update_pheromones(self, all_paths):
+        for i in range(self.city_count):
+            for j in range(self.city_count):
+                self.pheromone[i][j] *= (1 - self.rho)
+                if self.pheromone[i][j] < 0.1:
+                    self.pheromone[i][j] = 0.1
+                if self.pheromone[i][j] > 50:
+                    self.pheromone[i][j] = 50
+        for path, distance in all_paths:
+            if distance <= 0:
+                continue
+            deposit = self.Q / distance
+            for k in range(len(path) - 1):
+                i = path[k]
+                j = path[k+1]
+                self.pheromone[i][j] += deposit
+                self.pheromone[j][i] += deposit
+
+
+def euclidean_distance_matrix(cities):
+    city_count = len(cities)
+    distance_matrix = [[0] * city_count for _ in range(city_count)]
+    for i in range(city_count):
+        xi, yi, _ = cities[i]
+        for j in range(city_count):
+            if i != j:
+                xj, yj, _ = cities[j]
+                distance_matrix[i][j] = int(math.sqrt((xi - xj) ** 2 + (yi - yj) ** 2))
+    return distance_matrix
+
+
+# Arayüz olmadan çözüm; progress(iteration, best_distance) her iterasyon sonunda çağrılır
+def solve(cities, distance_matrix, ant_count, iterations, alpha=1.0, beta=2.0, rho=0.1, Q=100, progress=None):
+    colony = AntColony(cities, distance_matrix, ant_count, alpha, beta, rho, Q)
+    tours = [new_tour_buffer(colony.city_count) for _ in range(ant_count)]
+    best_path = None
+    best_distance = float('inf')
+    best_ant = None
+    history = []
+    for iteration in range(iterations):
+        results = [AntResult(ant_num, distance, path)
+                   for ant_num, (path, distance) in enumerate((colony.build_ant_path(tour) for tour in tours), start=1)]
+        iter_best = min(results, key=lambda x: x.distance)
+        if iter_best.distance < best_distance:
+            best_distance = iter_best.distance
+            best_ant = iter_best.ant
+            best_path = iter_best.path[:]
+        colony.update_pheromones((result.path, result.distance) for result in results)
+        history.append(IterationRecord(iteration + 1, best_distance, best_path))
+        if progress is not None:
+            progress(iteration + 1, best_distance)
+    return best_path, best_distance, best_ant, history
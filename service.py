@@ -0,0 +1,266 @@
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import signal
+import socketserver
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from colony import CityTable, solve, euclidean_distance_matrix
+
+
+# Yerel toplu çözüm servisi: her satır bir JSON istek, her cevap bir JSON satır
+#   {"command": "submit", "cities": [[x, y, "A"], ...], "ant_count": 20, "iterations": 100,
+#    "distance_matrix": [[...]] (isteğe bağlı, yoksa euclidean), "alpha": 1.0, "beta": 2.0, "rho": 0.1, "Q": 100}
+#   {"command": "status", "job_id": 1}
+#   {"command": "result", "job_id": 1}
+#   {"command": "jobs"}
+
+DEFAULT_PARAMS = {'alpha': 1.0, 'beta': 2.0, 'rho': 0.1, 'Q': 100}
+
+
+def check_distance_matrix(distance_matrix):
+    # Hatalı matrisler işçiye gönderilmeden reddedilir; aksi halde havuzda sıfıra bölme ile düşer
+    total = 0
+    for i, row in enumerate(distance_matrix):
+        for j, val in enumerate(row):
+            if i == j:
+                continue
+            if not math.isfinite(val) or val < 0:
+                raise ValueError(f"Geçersiz mesafe ({i}, {j}): {val}")
+            total += val
+    if total <= 0:
+        raise ValueError("Tüm mesafeler sıfır; şehirlerin en az ikisi farklı konumda olmalı.")
+
+
+def to_int(value, name):
+    # JSON 1e400 / Infinity float('inf') olarak gelir; int() bunlarda OverflowError verir
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"{name} sonlu bir sayı olmalı: {value}")
+    return int(value)
+
+
+def check_params(params):
+    for name, val in params.items():
+        if not math.isfinite(val):
+            raise ValueError(f"{name} sonlu bir sayı olmalı: {val}")
+    if not 0 <= params['rho'] <= 1:
+        raise ValueError(f"rho 0 ile 1 arasında olmalı: {params['rho']}")
+    if params['Q'] <= 0:
+        raise ValueError(f"Q pozitif olmalı: {params['Q']}")
+
+
+def run_job(job_id, cities, distance_matrix, ant_count, iterations, params, progress):
+    def report(iteration, best_distance):
+        progress[job_id] = (iteration, best_distance)
+
+    cities = CityTable(cities)
+    best_path, best_distance, best_ant, history = solve(cities, distance_matrix, ant_count, iterations,
+                                                        progress=report, **params)
+    return {
+        'best_distance': best_distance,
+        'best_ant': best_ant,
+        'best_path': [cities.labels[i] for i in best_path] if best_path else [],
+        'history': [record.best_distance for record in history],
+    }
+
+
+class SolveService:
+    def __init__(self, workers=None, cache_size=32, max_finished=1000):
+        # Sunucu thread'leri çalışırken fork güvenli değil; işçiler spawn ile başlatılır
+        self.workers = workers
+        self.executor = self.new_executor()
+        self.manager = multiprocessing.Manager()
+        self.progress = self.manager.dict()  # job_id -> (iteration, best_distance), işçi süreçler yazar
+        self.jobs = {}
+        self.max_finished = max_finished  # Saklanan en fazla biten iş; eskiler silinir
+        self.job_ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.cache_size = cache_size
+        self.matrix_cache = OrderedDict()  # Aynı şehir listesi tekrar gelirse mesafe matrisi yeniden hesaplanmaz
+
+    def new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def distance_matrix_for(self, cities):
+        key = hashlib.sha1(json.dumps(cities).encode()).hexdigest()
+        with self.lock:
+            if key in self.matrix_cache:
+                self.matrix_cache.move_to_end(key)
+                return self.matrix_cache[key]
+        distance_matrix = euclidean_distance_matrix(CityTable(cities))
+        check_distance_matrix(distance_matrix)
+        with self.lock:
+            self.matrix_cache[key] = distance_matrix
+            if len(self.matrix_cache) > self.cache_size:
+                self.matrix_cache.popitem(last=False)
+        return distance_matrix
+
+    def submit(self, request):
+        cities = [[to_int(x, 'x'), to_int(y, 'y'), str(label)] for x, y, label in request['cities']]
+        if len(cities) < 2:
+            raise ValueError("En az iki şehir gerekli.")
+        ant_count = to_int(request.get('ant_count', 20), 'ant_count')
+        iterations = to_int(request.get('iterations', 100), 'iterations')
+        if ant_count < 1 or iterations < 1:
+            raise ValueError("ant_count ve iterations pozitif olmalı.")
+        params = {name: float(request.get(name, default)) for name, default in DEFAULT_PARAMS.items()}
+        check_params(params)
+        distance_matrix = request.get('distance_matrix')
+        if distance_matrix is None:
+            distance_matrix = self.distance_matrix_for(cities)
+        else:
+            if len(distance_matrix) != len(cities) or any(len(row) != len(cities) for row in distance_matrix):
+                raise ValueError("Mesafe matrisi şehir sayısıyla uyuşmuyor.")
+            distance_matrix = [[float(val) for val in row] for row in distance_matrix]
+            check_distance_matrix(distance_matrix)
+
+        with self.lock:
+            self.evict_finished()
+            job_id = next(self.job_ids)
+            executor = self.executor
+        job_args = (run_job, job_id, cities, distance_matrix, ant_count, iterations, params, self.progress)
+        try:
+            future = executor.submit(*job_args)
+        except BrokenProcessPool:
+            # Bir işçi çöktüyse (ör. bellek yetersizliği) havuz yenilenir ve iş bir kez daha denenir
+            with self.lock:
+                if self.executor is executor:
+                    self.executor = self.new_executor()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                executor = self.executor
+            future = executor.submit(*job_args)
+        # İş yalnızca havuza kabul edildikten sonra kaydedilir
+        with self.lock:
+            self.jobs[job_id] = {'iterations': iterations, 'future': future}
+        return {'job_id': job_id}
+
+    def evict_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['future'].done()]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+            self.progress.pop(job_id, None)
+
+    def get_job(self, request):
+        job_id = to_int(request['job_id'], 'job_id')
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Bilinmeyen iş: {job_id}")
+        return job_id, job
+
+    def status(self, request):
+        job_id, job = self.get_job(request)
+        future = job['future']
+        iteration, best_distance = self.progress.get(job_id, (0, None))
+        if future.done():
+            state = 'failed' if future.exception() is not None else 'done'
+        elif future.running():
+            state = 'running'
+        else:
+            state = 'queued'
+        return {'job_id': job_id, 'state': state, 'iteration': iteration,
+                'iterations': job['iterations'], 'best_distance': best_distance}
+
+    def result(self, request):
+        job_id, job = self.get_job(request)
+        future = job['future']
+        if not future.done():
+            return self.status(request)
+        if future.exception() is not None:
+            return {'job_id': job_id, 'state': 'failed', 'error': str(future.exception())}
+        return dict(future.result(), job_id=job_id, state='done')
+
+    def list_jobs(self, request):
+        with self.lock:
+            job_ids = list(self.jobs)
+        return {'jobs': [self.status({'job_id': job_id}) for job_id in job_ids]}
+
+    def handle(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("İstek bir JSON nesnesi olmalı.")
+        commands = {
+            'submit': self.submit,
+            'status': self.status,
+            'result': self.result,
+            'jobs': self.list_jobs,
+        }
+        command = commands.get(request.get('command'))
+        if command is None:
+            raise ValueError(f"Bilinmeyen komut: {request.get('command')}")
+        return command(request)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.manager.shutdown()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.service.handle(json.loads(line))
+                response['ok'] = True
+            except Exception as e:
+                # Beklenmeyen hatalar da bağlantıyı koparmadan istemciye iletilir
+                response = {'ok': False, 'error': str(e) or type(e).__name__}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+class TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ACO toplu çözüm servisi")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="TCP yerine Unix soket yolu")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--cache-size', type=int, default=32)
+    parser.add_argument('--max-finished', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.unix and os.path.exists(args.unix):
+        if not stat.S_ISSOCK(os.stat(args.unix).st_mode):
+            parser.error(f"{args.unix} bir soket değil; silinmeyecek.")
+        os.remove(args.unix)
+
+    if args.unix:
+        server = UnixServer(args.unix, RequestHandler)
+        address = args.unix
+    else:
+        server = TCPServer((args.host, args.port), RequestHandler)
+        address = f"{args.host}:{args.port}"
+    service = SolveService(args.workers, args.cache_size, args.max_finished)
+    server.service = service
+    # SIGTERM de Ctrl+C gibi aşağıdaki temizliği çalıştırsın
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Servis {address} adresinde, {args.workers} işçi ile çalışıyor.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()